@@ -0,0 +1,120 @@
+"""
+DELL EMC ECS API Data Collection Module.
+
+Offline benchmark of /object/bucket page sizing.  Drives ECSPageSizeTuner through a simulated
+listing for several round trip and per bucket cost profiles and compares the total listing time
+against always using the fixed ECS default page size of 1000.
+
+Run from the ecs-bucket-listing directory:
+
+    python benchmark/page_size_benchmark.py
+"""
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from ecs.ecs import ECSPageSizeTuner
+
+# Constants
+TOTAL_BUCKETS = 50000                                       # Buckets in the simulated namespace
+FIXED_PAGE_SIZE = 1000                                      # ECS default page size
+MIN_PAGE_SIZE = 100                                         # Defaults from ecs_config.sample
+MAX_PAGE_SIZE = 10000
+TARGET_PAGE_LATENCY = 5
+READ_TIMEOUT = 60
+MAX_RETRIES = 3                                             # Matches ECSManagementAPI
+JITTER = 0.1                                                # +/- fraction of noise on each page
+SEED = 26
+
+# Profiles are (name, round trip seconds, seconds per bucket, ECS page cap, change) where change
+# is None or (buckets listed, new round trip, new seconds per bucket) applied part way through
+PROFILES = [
+    ('LAN, small buckets', 0.005, 0.00005, None, None),
+    ('LAN', 0.02, 0.0005, None, None),
+    ('WAN', 0.15, 0.0005, None, None),
+    ('High RTT', 1.0, 0.0002, None, None),
+    ('Very high RTT', 4.5, 0.0001, None, None),
+    ('Slow ECS', 0.05, 0.002, None, None),
+    ('Very slow ECS, over target', 0.05, 0.01, None, None),
+    ('ECS caps pages at 1500', 0.3, 0.0002, 1500, None),
+    ('Link degrades mid listing', 0.02, 0.0002, None, (20000, 1.0, 0.0002)),
+    ('ECS load spike mid listing', 0.1, 0.0005, None, (20000, 0.1, 0.08)),
+]
+
+
+def simulate_listing(profile, tuner=None):
+    """
+    List TOTAL_BUCKETS against a simulated ECS.  Pages are a fixed size unless a tuner is given.
+    Returns (seconds, pages) or None if the listing failed the way ecs_get_bucket_data() would.
+    """
+    name, rtt, per_bucket, cap, change = profile
+    noise = random.Random(SEED)
+    remaining = TOTAL_BUCKETS
+    elapsed = 0.0
+    pages = 0
+    failures = 0
+
+    while remaining:
+        if change and TOTAL_BUCKETS - remaining >= change[0]:
+            rtt, per_bucket = change[1], change[2]
+
+        requested = tuner.page_size if tuner else FIXED_PAGE_SIZE
+        returned = min(requested, cap or requested, remaining)
+        latency = (rtt + per_bucket * returned) * noise.uniform(1 - JITTER, 1 + JITTER)
+
+        if latency > READ_TIMEOUT:
+            elapsed += READ_TIMEOUT
+            if tuner and tuner.timed_out():
+                continue
+            failures += 1
+            if failures > MAX_RETRIES:
+                return None
+            continue
+
+        elapsed += latency
+        pages += 1
+        failures = 0
+        remaining -= returned
+        if tuner:
+            tuner.record(latency, requested, returned, remaining == 0)
+
+    return elapsed, pages
+
+
+def main():
+    logger = logging.getLogger(__name__)
+    logger.addHandler(logging.NullHandler())
+
+    print('{0:<28} {1:>18} {2:>18} {3:>8} {4:>10}'.format('Profile', 'Fixed 1000', 'Adaptive', 'Speedup',
+                                                          'Final size'))
+    slower = []
+    for profile in PROFILES:
+        fixed = simulate_listing(profile)
+        tuner = ECSPageSizeTuner(FIXED_PAGE_SIZE, MIN_PAGE_SIZE, MAX_PAGE_SIZE, TARGET_PAGE_LATENCY,
+                                 READ_TIMEOUT, logger)
+        adaptive = simulate_listing(profile, tuner)
+
+        fixed_text = 'failed' if fixed is None else '{0:.1f}s/{1} pages'.format(*fixed)
+        adaptive_text = 'failed' if adaptive is None else '{0:.1f}s/{1} pages'.format(*adaptive)
+        if fixed is None or adaptive is None:
+            speedup = '-'
+        else:
+            speedup = '{0:.2f}x'.format(fixed[0] / adaptive[0])
+
+        print('{0:<28} {1:>18} {2:>18} {3:>8} {4:>10}'.format(profile[0], fixed_text, adaptive_text, speedup,
+                                                              tuner.page_size))
+
+        if adaptive is None and fixed is not None or fixed and adaptive and adaptive[0] > fixed[0]:
+            slower.append(profile[0])
+
+    if slower:
+        print('\nAdaptive page sizing was slower than the fixed default for: ' + ', '.join(slower))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
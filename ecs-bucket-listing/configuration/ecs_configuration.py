@@ -91,3 +91,50 @@ class ECSBucketListingConfiguration(object):
 
             if not ecsconnection['readTimeout']:
                 ecsconnection['readTimeout'] = "60"
+
+            # Validate /object/bucket page size tuning, these are optional so older configurations still load
+            if not ecsconnection.get('pageSize'):
+                ecsconnection['pageSize'] = "1000"
+
+            if not ecsconnection.get('minPageSize'):
+                ecsconnection['minPageSize'] = "100"
+
+            if not ecsconnection.get('maxPageSize'):
+                ecsconnection['maxPageSize'] = "10000"
+
+            if not ecsconnection.get('targetPageLatency'):
+                ecsconnection['targetPageLatency'] = "5"
+
+            for setting in ['pageSize', 'minPageSize', 'maxPageSize']:
+                if not str(ecsconnection[setting]).isnumeric() or int(ecsconnection[setting]) <= 0:
+                    raise InvalidConfigurationException("The ECS Management " + setting + " of " +
+                                                        str(ecsconnection[setting]) + " for host " +
+                                                        ecsconnection['host'] + " is not numeric greater than 0.")
+
+            # These are used as float seconds so allow fractions
+            for setting in ['connectTimeout', 'readTimeout', 'targetPageLatency']:
+                try:
+                    seconds = float(ecsconnection[setting])
+                except (TypeError, ValueError):
+                    seconds = 0
+                if not seconds > 0:
+                    raise InvalidConfigurationException("The ECS Management " + setting + " of " +
+                                                        str(ecsconnection[setting]) + " for host " +
+                                                        ecsconnection['host'] +
+                                                        " is not a number of seconds greater than 0.")
+
+            if int(ecsconnection['minPageSize']) > int(ecsconnection['maxPageSize']):
+                raise InvalidConfigurationException("The ECS Management minPageSize for host " + ecsconnection['host'] +
+                                                    " is greater than its maxPageSize.")
+
+            if not int(ecsconnection['minPageSize']) <= int(ecsconnection['pageSize']) <= int(ecsconnection['maxPageSize']):
+                raise InvalidConfigurationException("The ECS Management pageSize of " + str(ecsconnection['pageSize']) +
+                                                    " for host " + ecsconnection['host'] + " is not between its "
+                                                    "minPageSize and maxPageSize.")
+
+            # A page can never be slower than the read timeout so a target at or above it would never shrink pages
+            if float(ecsconnection['targetPageLatency']) >= float(ecsconnection['readTimeout']):
+                raise InvalidConfigurationException("The ECS Management targetPageLatency of " +
+                                                    str(ecsconnection['targetPageLatency']) + " for host " +
+                                                    ecsconnection['host'] + " must be less than its readTimeout of " +
+                                                    str(ecsconnection['readTimeout']) + ".")
@@ -105,20 +105,25 @@ def ecs_collect_bucket_info(logger, ecsmanagmentapi, pollinginterval, tempdir):
                 # Reset marker
                 next_marker = None
 
-                # Reset buckets counter
+                # Reset buckets counter and page statistics
                 new_buckets = 0
+                ecsconnection.reset_page_stats()
+                cycle_start = time.monotonic()
+                listing_failed = False
 
                 while True:
                     # Retrieve current bucket data via API for current VDC.  This may be
                     # called multiple times to iterate thru all buckets depending on
-                    # of buckets i.e. deal with default page size of 1000
+                    # of buckets i.e. deal with the page size chosen by the page size tuner
                     bucket_data_file = ecsconnection.ecs_get_bucket_data(tempdir, next_marker,
                                                                          _configuration.namespace)
 
                     if bucket_data_file is None:
                         logger.info(MODULE_NAME + '::ecs_collect_bucket_info()::'
-                                                  'Unable to retrieve ECS Bucket Information')
-                        return
+                                                  'Unable to retrieve ECS Bucket Information for host ' + key +
+                                                  '.  Skipping it until the next polling cycle.')
+                        listing_failed = True
+                        break
                     else:
                         """
                         We have an XML File lets parse it
@@ -135,7 +140,9 @@ def ecs_collect_bucket_info(logger, ecsmanagmentapi, pollinginterval, tempdir):
                                 next_marker = nm.text
 
                             # For each bucket grab bucket id and owner and add it to counter
-                            for bucket in root.findall('object_bucket'):
+                            buckets = root.findall('object_bucket')
+                            ecsconnection.record_page(len(buckets), next_marker is None)
+                            for bucket in buckets:
                                 bucketid = bucket.find('id').text
                                 owner = bucket.find('owner').text
 
@@ -161,6 +168,10 @@ def ecs_collect_bucket_info(logger, ecsmanagmentapi, pollinginterval, tempdir):
                     if next_marker is None:
                         break
 
+                # A partial listing would give a misleading count so move on to the next host
+                if listing_failed:
+                    continue
+
                 # Log stats line
                 if not _configuration.objectuser:
                     _logger.info(MODULE_NAME + '::ecs_collect_bucket_info::Discovered ' + str(new_buckets) +
@@ -169,6 +180,12 @@ def ecs_collect_bucket_info(logger, ecsmanagmentapi, pollinginterval, tempdir):
                     _logger.info(MODULE_NAME + '::ecs_collect_bucket_info::Discovered ' + str(new_buckets) +
                          ' buckets for namespace ' + _configuration.namespace + ' and object user ' + _configuration.objectuser)
 
+                _logger.info(MODULE_NAME + '::ecs_collect_bucket_info::Listed host ' + key + ' in ' +
+                             '{0:.3f}'.format(time.monotonic() - cycle_start) + ' seconds over ' +
+                             str(len(ecsconnection.page_sizes)) + ' pages using page sizes (requested/returned) ' +
+                             ', '.join('{0}/{1}'.format(requested, returned)
+                                       for requested, returned in ecsconnection.page_sizes))
+
             if controlledShutdown.kill_now:
                 logger.info(MODULE_NAME + '::ecs_collect_bucket_info()::Shutdown detected.  Terminating polling.')
                 break
@@ -212,7 +229,11 @@ def ecs_authenticate():
 
                 # Instantiate ECS Management API object, and it to our list, and validate that we are authenticated
                 _ecsManagmentAPI[ecsconnection['host']] = ECSManagementAPI(auth, ecsconnection['connectTimeout'],
-                                                                            ecsconnection['readTimeout'],_logger)
+                                                                            ecsconnection['readTimeout'], _logger,
+                                                                            pagesize=ecsconnection['pageSize'],
+                                                                            minpagesize=ecsconnection['minPageSize'],
+                                                                            maxpagesize=ecsconnection['maxPageSize'],
+                                                                            targetpagelatency=ecsconnection['targetPageLatency'])
                 if not _ecsAuthentication:
                     _logger.info(MODULE_NAME + '::ecs_authenticate()::ECS Data Collection '
                                                'Module is not ready.  Please check logs.')
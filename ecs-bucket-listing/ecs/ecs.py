@@ -3,9 +3,11 @@ DELL EMC ECS API Data Collection Module.
 """
 import os
 import json
+import time
 import requests
 import urllib3
 import uuid
+from collections import deque
 from requests.auth import HTTPBasicAuth
 try:
     import xml.etree.cElementTree as ET
@@ -68,12 +70,140 @@ class ECSAuthentication(object):
             self.token = None
 
 
+class ECSPageSizeTuner(object):
+    """
+    Tunes the /object/bucket page size for a single VDC from observed latency and bucket counts
+    """
+
+    def __init__(self, initial, minimum, maximum, target_latency, read_timeout, logger, window=10, decay=0.8):
+        self.minimum = int(minimum)
+        self.maximum = int(maximum)
+        self.target_latency = float(target_latency)
+        self.page_size = max(self.minimum, min(self.maximum, int(initial)))
+        self.initial_page_size = self.page_size
+        self.logger = logger
+
+        # Pages are planned below the target so that normal jitter does not push them over
+        # it, and never closer than this to the read timeout however large the round trip
+        self.planned_latency = 0.8 * self.target_latency
+        self.safe_latency = 0.5 * float(read_timeout)
+
+        # A page slower than the model predicts by this factor means ECS is slowing down
+        self.slowdown_factor = 1.25
+
+        # Recent (buckets, latency) samples, newer samples carry more weight in the fit
+        self.samples = deque(maxlen=window)
+        self.decay = decay
+        self.rtt = None
+        self.seconds_per_bucket = None
+
+    def record(self, latency, requested, buckets, last_page):
+        """
+        Update estimates from a completed page and pick the size of the next one
+        """
+        # Guard against clocks too coarse to time a fast page
+        latency = max(latency, 0.001)
+
+        # Judge the page against what the model expected before the page is folded into it
+        predicted = None
+        if self.seconds_per_bucket is not None:
+            predicted = self.rtt + self.seconds_per_bucket * buckets
+
+        if buckets:
+            self.samples.append((buckets, latency))
+            self._fit()
+
+        # ECS returned fewer buckets than asked for but has more to give so it is capping the limit
+        if not last_page and 0 < buckets < requested and buckets < self.maximum:
+            self.logger.info('ECSPageSizeTuner::record()::ECS returned ' + str(buckets) + ' buckets for a '
+                             'requested page size of ' + str(requested) + '.  Capping page size at ' + str(buckets))
+            self.maximum = max(self.minimum, buckets)
+
+        if predicted is not None and latency > self.target_latency and latency > self.slowdown_factor * predicted:
+            # ECS is slower than this page size has been so back off straight away
+            self._resize(self.page_size // 2, 'page latency of {0:.3f}s against {1:.3f}s predicted'.format(
+                latency, predicted))
+            return
+
+        if self.seconds_per_bucket is None:
+            # Not enough spread in page sizes to fit a cost model yet.  Latency grows no faster
+            # than the bucket count so doubling at most doubles it.
+            if 2 * latency <= self.safe_latency:
+                self._resize(self.page_size * 2, 'page latency of {0:.3f}s'.format(latency))
+            return
+
+        # Pages may take as long as the target, or five round trips so the round trip is at most
+        # a fifth of a page on high RTT links, but never close to the read timeout
+        budget = min(max(self.planned_latency, 5 * self.rtt), self.safe_latency)
+        ceiling = int((budget - self.rtt) / self.seconds_per_bucket)
+
+        if latency > self.target_latency:
+            # The page is as slow as its size and the round trip explain.  Come back within
+            # budget, but never below the configured page size as that only adds round trips.
+            size = max(ceiling, self.initial_page_size)
+            if size < self.page_size:
+                self._resize(size, 'rtt {0:.3f}s, {1:.6f}s per bucket'.format(self.rtt, self.seconds_per_bucket))
+            return
+
+        # Latency is under target so only grow, at most doubling per page, and ignore
+        # small corrections so the page size settles
+        size = min(ceiling, self.page_size * 2)
+        if size < 1.1 * self.page_size:
+            return
+
+        self._resize(size, 'rtt {0:.3f}s, {1:.6f}s per bucket'.format(self.rtt, self.seconds_per_bucket))
+
+    def timed_out(self):
+        """
+        Shrink the page size after a read timeout.  Returns False if we are already at the minimum.
+        """
+        if self.page_size <= self.minimum:
+            return False
+        self._resize(self.page_size // 2, 'request timed out')
+        return True
+
+    def _fit(self):
+        """
+        Weighted least squares fit of latency against bucket count.  The intercept is the
+        round trip time and the slope is the cost of each bucket.
+        """
+        weights = [self.decay ** age for age in range(len(self.samples) - 1, -1, -1)]
+        total = sum(weights)
+        mean_buckets = sum(w * b for w, (b, l) in zip(weights, self.samples)) / total
+        mean_latency = sum(w * l for w, (b, l) in zip(weights, self.samples)) / total
+        variance = sum(w * (b - mean_buckets) ** 2 for w, (b, l) in zip(weights, self.samples)) / total
+        covariance = sum(w * (b - mean_buckets) * (l - mean_latency) for w, (b, l) in zip(weights, self.samples)) / total
+
+        # Only trust the slope when recent page sizes differ by a useful amount, otherwise keep
+        # the last slope and let the intercept follow the latencies we are seeing now
+        if variance > (0.05 * mean_buckets) ** 2 and covariance > 0:
+            self.seconds_per_bucket = covariance / variance
+
+        if self.seconds_per_bucket is not None:
+            self.rtt = mean_latency - self.seconds_per_bucket * mean_buckets
+
+            # A negative round trip means the window spans a change in the link or in ECS, so
+            # start the fit again from the latest page, keeping the slope until pages spread again
+            if self.rtt < 0:
+                buckets, latency = self.samples[-1]
+                self.samples = deque([self.samples[-1]], maxlen=self.samples.maxlen)
+                self.rtt = max(0.0, latency - self.seconds_per_bucket * buckets)
+
+    def _resize(self, size, reason):
+        size = max(self.minimum, min(self.maximum, size))
+        if size != self.page_size:
+            self.logger.debug('ECSPageSizeTuner::_resize()::Changing page size from ' + str(self.page_size) +
+                              ' to ' + str(size) + ': ' + reason)
+            self.page_size = size
+
+
 class ECSManagementAPI(object):
     """
     Perform ECS Management API Calls
     """
 
-    def __init__(self, authentication, connecttimeout, readtimeout, logger, response_json=None, response_xml=None):
+    def __init__(self, authentication, connecttimeout, readtimeout, logger, response_json=None, response_xml=None,
+                 pagesize=1000, minpagesize=100, maxpagesize=10000, targetpagelatency=5, maxretries=3):
         self.ecs_authentication_failure = int('497')
         self.authentication = authentication
         self.response_json = response_json
@@ -82,24 +212,88 @@ class ECSManagementAPI(object):
         self.readtimeout = readtimeout
         self.logger = logger
         self.response_xml_file = None
+        self.page_tuner = ECSPageSizeTuner(pagesize, minpagesize, maxpagesize, targetpagelatency, readtimeout,
+                                           logger)
+        self.page_sizes = []
+        self.last_page_size = None
+        self.last_page_latency = None
+        self.max_retries = maxretries
+
+    def reset_page_stats(self):
+        """
+        Clear the page sizes recorded for the current listing cycle
+        """
+        self.page_sizes = []
+
+    def record_page(self, buckets, last_page):
+        """
+        Feed the bucket count of the page last returned by ecs_get_bucket_data() back into the page size tuner
+        """
+        self.page_sizes.append((self.last_page_size, buckets))
+        self.page_tuner.record(self.last_page_latency, self.last_page_size, buckets, last_page)
 
     def ecs_get_bucket_data(self, tempdir, marker, namespace):
 
+        # Never hand back a file from an earlier page
+        self.response_xml_file = None
+
+        # Failed calls that shrinking the page cannot help with
+        failures = 0
+
         while True:
             # Perform ECS Bucket API Call
             headers = {'X-SDS-AUTH-TOKEN': "'{0}'".format(self.authentication.token),
                        'content-type': 'application/json'}
 
             # Setup parameters and make API call
+            page_size = self.page_tuner.page_size
+            params_dict = {'limit': page_size}
             if marker:
-                params_dict = {'marker': marker}
-                r = requests.get("{0}//object/bucket?namespace={1}".format(self.authentication.url, namespace),
-                                 headers=headers, verify=False, params=params_dict)
-            else:
+                params_dict['marker'] = marker
+
+            start = time.monotonic()
+            try:
                 r = requests.get("{0}//object/bucket?namespace={1}".format(self.authentication.url, namespace),
-                                 headers=headers, verify=False)
+                                 headers=headers, verify=False, params=params_dict,
+                                 timeout=(float(self.connecttimeout), float(self.readtimeout)))
+            except requests.exceptions.ConnectTimeout:
+                # Nothing to do with page size so just retry
+                failures += 1
+                if failures <= self.max_retries:
+                    self.logger.warning('ECSManagementAPI::ecs_get_bucket_data()::Connecting to host '
+                                        + self.authentication.host + ' timed out.  Retrying.')
+                    continue
+                self.logger.error('ECSManagementAPI::ecs_get_bucket_data()::/object/bucket call against host '
+                                  + self.authentication.host + ' failed after ' + str(failures) + ' attempts')
+                break
+            except requests.exceptions.RequestException as e:
+                # A read timeout while the body is streaming is raised as a ConnectionError
+                # wrapping urllib3's ReadTimeoutError, and is just as much about page size
+                read_timeout = isinstance(e, requests.exceptions.ReadTimeout) or \
+                    (e.args and isinstance(e.args[0], urllib3.exceptions.ReadTimeoutError))
+
+                if read_timeout and self.page_tuner.timed_out():
+                    self.logger.warning('ECSManagementAPI::ecs_get_bucket_data()::/object/bucket call against host '
+                                        + self.authentication.host + ' timed out with a page size of ' + str(page_size)
+                                        + '.  Retrying with a page size of ' + str(self.page_tuner.page_size))
+                    continue
+                failures += 1
+                if failures <= self.max_retries:
+                    self.logger.warning('ECSManagementAPI::ecs_get_bucket_data()::/object/bucket call against host '
+                                        + self.authentication.host + ' with a page size of ' + str(page_size)
+                                        + ' failed: ' + str(e) + '.  Retrying.')
+                    continue
+                self.logger.error('ECSManagementAPI::ecs_get_bucket_data()::/object/bucket call against host '
+                                  + self.authentication.host + ' failed after ' + str(failures)
+                                  + ' attempts with a page size of ' + str(page_size) + ': ' + str(e))
+                break
+            latency = time.monotonic() - start
 
             if r.status_code == requests.codes.ok:
+                # Kept for record_page() once the caller has counted the buckets
+                self.last_page_size = page_size
+                self.last_page_latency = latency
+
                 self.logger.debug('ECSManagementAPI::ecs_get_bucket_data()::'
                                   '/object/bucket call returned '
                                   'with a 200 status code.  Text is: ' + r.text)